@@ -1,20 +1,26 @@
 import asyncio
 import logging
 import sys
+from pathlib import Path
 
 import click
-import sentry_sdk
-from sentry_sdk.integrations.asyncio import AsyncioIntegration
 
 from . import config
 
-sentry_sdk.init(
-    dsn=config.SENTRY_DSN,
-    traces_sample_rate=0.05,
-    integrations=[
-        AsyncioIntegration(),
-    ],
-)
+
+def init_sentry():
+    # Sentry and its integrations are expensive to import,
+    # we only load them once we actually start a bot.
+    import sentry_sdk
+    from sentry_sdk.integrations.asyncio import AsyncioIntegration
+
+    sentry_sdk.init(
+        dsn=config.SENTRY_DSN,
+        traces_sample_rate=0.05,
+        integrations=[
+            AsyncioIntegration(),
+        ],
+    )
 
 
 @click.group()
@@ -24,8 +30,15 @@ def cli():
 
 @cli.group(chain=True)
 @click.option("-v", "--verbose", is_flag=True, help="Enables verbose mode.")
-def run(verbose):
+@click.option(
+    "--profile",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Profile the handlers and write the profiles to this directory on SIGUSR1.",
+)
+@click.pass_context
+def run(ctx, verbose, profile):
     """Run an assistent bot."""
+    ctx.obj = {"profile_dir": profile}
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(
         logging.Formatter("%(asctime)s %(levelname)7s %(name)s - %(message)s")
@@ -33,14 +46,16 @@ def run(verbose):
     logging.basicConfig(
         handlers=[handler], level=logging.DEBUG if verbose else logging.INFO
     )
+    init_sentry()
 
 
 @run.command()
-def slack():
+@click.pass_obj
+def slack(obj):
     """Run the Slack bot demon."""
     from .slack import run_slack
 
-    asyncio.run(run_slack())
+    asyncio.run(run_slack(**obj))
 
 
 if __name__ == "__main__":
@@ -6,13 +6,14 @@ import json
 import logging
 import time
 from pathlib import Path
-from urllib.parse import urljoin
+from typing import TYPE_CHECKING
 
 import httpx
-import openai
-from openai._types import FileTypes
 
-from . import config, redis_utils
+from . import config, openwebui, redis_utils
+
+if TYPE_CHECKING:  # pragma: no cover
+    from openai._types import FileTypes
 
 AUDIO_FORMATS = ["mp3", "mp4", "mpeg", "mpga", "m4a", "wav", "webm"]
 
@@ -58,13 +59,15 @@ async def add_message(
                 "Authorization": f"Bearer {config.OPEN_WEBUI_API_KEY}",
                 "Accept": "application/json",
             }
-            files = {"file": file_content}
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    urljoin(config.OPEN_WEBUI_URL, "/api/v1/files/"),
-                    headers=headers,
-                    files=files,
-                )
+            # read the content upfront, so the upload can be retried on another replica
+            files = {"file": file_content.getvalue()}
+            response = await openwebui.request(
+                "POST",
+                "/api/v1/files/",
+                headers=headers,
+                files=files,
+                hedge=False,
+            )
             response.raise_for_status()
             new_file = response.json()
             file_ids.append(new_file["id"])
@@ -79,6 +82,8 @@ async def add_message(
 
 async def tts(text: str) -> bytes:
     """Convert text to speech using the OpenAI API."""
+    import openai
+
     client: openai.AsyncOpenAI = openai.AsyncOpenAI()
     response = await client.audio.speech.create(
         model=config.TTS_MODEL,
@@ -90,6 +95,8 @@ async def tts(text: str) -> bytes:
 
 async def stt(audio: FileTypes) -> str:
     """Convert speech to text using the OpenAI API."""
+    import openai
+
     client: openai.AsyncOpenAI = openai.AsyncOpenAI()
     response = await client.audio.transcriptions.create(
         model="whisper-1",
@@ -156,11 +163,26 @@ OPEN_WEBUI_AUTH_HEADERS = {
 }
 
 
+#: Seconds the tool IDs are cached for.
+TOOL_IDS_TTL = 5 * 60
+
+_TOOL_IDS: tuple[float, list[str]] | None = None
+
+
 async def get_tool_ids() -> list[str]:
     """Get the default tools configured for an agent."""
-    url = urljoin(config.OPEN_WEBUI_URL, "/api/models")
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=OPEN_WEBUI_AUTH_HEADERS, timeout=5)
+    global _TOOL_IDS
+    if _TOOL_IDS is None or time.monotonic() - _TOOL_IDS[0] > TOOL_IDS_TTL:
+        logger.debug("Fetching the tool IDs of model %s", config.OPEN_WEBUI_MODEL)
+        _TOOL_IDS = time.monotonic(), await fetch_tool_ids()
+    return _TOOL_IDS[1]
+
+
+async def fetch_tool_ids() -> list[str]:
+    response = await openwebui.request(
+        "GET", "/api/models", headers=OPEN_WEBUI_AUTH_HEADERS, timeout=5
+    )
+    response.raise_for_status()
     for model in response.json()["data"]:
         if model["id"] == config.OPEN_WEBUI_MODEL:
             return model["info"]["meta"]["toolIds"]
@@ -168,11 +190,13 @@ async def get_tool_ids() -> list[str]:
 
 
 async def chat_with_model(thread: dict[str, list[dict[str, str | list[dict]]]]):
-    url = urljoin(config.OPEN_WEBUI_URL, "/api/chat/completions")
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url, json=thread, timeout=60 * 10, headers=OPEN_WEBUI_AUTH_HEADERS
-        )
+    response = await openwebui.request(
+        "POST",
+        "/api/chat/completions",
+        json=thread,
+        timeout=60 * 10,
+        headers=OPEN_WEBUI_AUTH_HEADERS,
+    )
     response.raise_for_status()
     data = response.json()
     if "choices" in data and data["choices"]:
@@ -14,14 +14,35 @@ _TRUTHY = {"1", "true", "yes", "on"}
 REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/")
 #: How often the bot randomly responds in a group channel.
 RANDOM_RUN_RATIO: float = float(os.getenv("RANDOM_RUN_RATIO", "0"))
+#: Seconds to wait for in-flight runs to finish on shutdown, before they are cancelled.
+SHUTDOWN_TIMEOUT: float = float(os.getenv("SHUTDOWN_TIMEOUT", "25"))
+#: Log the event loop's stack when it is blocked for longer than this many seconds.
+#: Zero disables the monitor.
+LOOP_LAG_THRESHOLD: float = float(os.getenv("LOOP_LAG_THRESHOLD", "0"))
+#: The port of the HTTP health endpoint, which is disabled if not set.
+HEALTH_PORT: int | None = int(os.getenv("HEALTH_PORT") or 0) or None
 
 # OpenWebUI
 #: The OpenWebUI domain URL, without /api at the end.
+#: Multiple replicas can be given as a comma-separated list.
 OPEN_WEBUI_URL: str | None = os.getenv("OPEN_WEBUI_URL")
+#: The OpenWebUI replicas requests are balanced across, parsed from `OPEN_WEBUI_URL`.
+OPEN_WEBUI_URLS: list[str] = [
+    url.strip() for url in (OPEN_WEBUI_URL or "").split(",") if url.strip()
+]
 #: The OpenWebUI API key, used for authentication.
 OPEN_WEBUI_API_KEY: str | None = os.getenv("OPEN_WEBUI_API_KEY")
 #: The OpenWebUI model to use for chat completions.
 OPEN_WEBUI_MODEL: str | None = os.getenv("OPEN_WEBUI_MODEL")
+#: Consecutive failures before an OpenWebUI replica is taken out of rotation.
+OPEN_WEBUI_FAILURE_THRESHOLD: int = int(os.getenv("OPEN_WEBUI_FAILURE_THRESHOLD", "3"))
+#: Seconds before a failed OpenWebUI replica is tried again.
+OPEN_WEBUI_RECOVERY_TIMEOUT: float = float(
+    os.getenv("OPEN_WEBUI_RECOVERY_TIMEOUT", "30")
+)
+#: Seconds to wait for a replica before sending the same request to another one.
+#: Hedging is disabled by default, since tools may be called twice.
+OPEN_WEBUI_HEDGE_DELAY: float = float(os.getenv("OPEN_WEBUI_HEDGE_DELAY", "0"))
 
 # OpenAI
 #: The OpenAI API key.
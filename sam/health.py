@@ -0,0 +1,42 @@
+"""HTTP health endpoint for load balancers and container orchestration.
+
+`GET /health` responds with `200` once the bot is warmed up and connected
+to Slack, and with `503` while it is starting or shutting down.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+
+from aiohttp import web
+
+from .lifecycle import Lifecycle
+
+logger = logging.getLogger(__name__)
+
+
+def get_app(lifecycle: Lifecycle) -> web.Application:
+    async def health(request: web.Request) -> web.Response:
+        status = lifecycle.status
+        return web.json_response(
+            {"status": status}, status=200 if status == "ready" else 503
+        )
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    return app
+
+
+@contextlib.asynccontextmanager
+async def serve(lifecycle: Lifecycle, port: int):
+    """Serve the health endpoint on all interfaces while the context is active."""
+    runner = web.AppRunner(get_app(lifecycle), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, port=port)
+    await site.start()
+    logger.info("Serving health endpoint on %s", site.name)
+    try:
+        yield runner
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,82 @@
+"""Graceful shutdown of the bot process.
+
+On SIGTERM or SIGINT the bot stops receiving new events, waits for in-flight
+runs to finish and cancels whatever is left once the deadline has passed.
+Cancelled runs leave their `async with` blocks, which releases their channel
+locks right away instead of blocking the channel until the lock times out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import signal
+
+logger = logging.getLogger(__name__)
+
+SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+class Lifecycle:
+    """Keep track of in-flight handlers and drain them on shutdown."""
+
+    def __init__(self):
+        self.tasks: set[asyncio.Task] = set()
+        self.ready = False
+        self.stopping = asyncio.Event()
+
+    @property
+    def status(self) -> str:
+        """Return whether the process is `starting`, `ready` or `stopping`."""
+        if self.stopping.is_set():
+            return "stopping"
+        return "ready" if self.ready else "starting"
+
+    def track(self, func):
+        """Decorate an event handler to be awaited during shutdown."""
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            task = asyncio.current_task()
+            self.tasks.add(task)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.tasks.discard(task)
+
+        return wrapper
+
+    def stop(self, signum: int | None = None):
+        """Initiate the shutdown."""
+        if signum is not None:
+            logger.info("Received %s, shutting down", signal.Signals(signum).name)
+            # a second signal falls back to the default behavior and kills us
+            loop = asyncio.get_running_loop()
+            for sig in SIGNALS:
+                loop.remove_signal_handler(sig)
+        self.stopping.set()
+
+    async def wait(self):
+        """Wait until the process receives a termination signal."""
+        loop = asyncio.get_running_loop()
+        for sig in SIGNALS:
+            loop.add_signal_handler(sig, self.stop, sig)
+        await self.stopping.wait()
+
+    async def drain(self, timeout: float):
+        """Wait for in-flight handlers and cancel those that exceed the timeout.
+
+        Args:
+            timeout: Seconds to wait for in-flight handlers to finish.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.tasks and (remaining := deadline - loop.time()) > 0:
+            logger.info("Waiting for %d in-flight runs", len(self.tasks))
+            await asyncio.wait(set(self.tasks), timeout=remaining)
+        if pending := set(self.tasks):
+            logger.warning("Cancelling %d runs after %ss", len(pending), timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,258 @@
+"""Client for one or more OpenWebUI replicas.
+
+Requests are routed to the endpoint with the least outstanding requests.
+Endpoints that fail repeatedly are taken out of rotation by a circuit breaker,
+requests to unhealthy endpoints are retried on the next one, as long as that
+is safe, and slow requests can be hedged by sending a second request to
+another replica.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from urllib.parse import urljoin
+
+import httpx
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+#: Methods that may safely be sent again, after the server received them.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+#: Statuses of a proxy or load balancer in front of an unhealthy replica.
+GATEWAY_ERRORS = {502, 503, 504}
+#: Errors raised before the request reached the server.
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def is_replica_failure(result: httpx.Response | httpx.RequestError) -> bool:
+    """Return whether the result indicates an unhealthy replica."""
+    if isinstance(result, httpx.Response):
+        return result.status_code in GATEWAY_ERRORS
+    return True
+
+
+def is_retryable(method: str, result: httpx.Response | httpx.RequestError) -> bool:
+    """Return whether the request may be sent to another replica.
+
+    Non-idempotent requests, like chat completions that may call tools,
+    are only retried if they never reached the server.
+    """
+    if method.upper() in IDEMPOTENT_METHODS:
+        return is_replica_failure(result)
+    return isinstance(result, UNSENT_ERRORS)
+
+
+class Endpoint:
+    """A single OpenWebUI replica and its circuit breaker state."""
+
+    def __init__(self, url: str, failure_threshold: int, recovery_timeout: float):
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.outstanding = 0
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    def __repr__(self):
+        return f"<Endpoint {self.url} outstanding={self.outstanding}>"
+
+    @property
+    def available(self) -> bool:
+        """Return whether the circuit is closed or ready for a trial request."""
+        if self.opened_at is None:
+            return True
+        # a half-open circuit only allows a single trial request at a time
+        return (
+            time.monotonic() - self.opened_at >= self.recovery_timeout
+            and not self.outstanding
+        )
+
+    def release(self):
+        self.outstanding -= 1
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("OpenWebUI endpoint %s recovered", self.url)
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(
+                    "OpenWebUI endpoint %s failed %d times, opening circuit",
+                    self.url,
+                    self.failures,
+                )
+            self.opened_at = time.monotonic()
+
+
+class EndpointPool:
+    """Balance, fail over and hedge requests across OpenWebUI endpoints.
+
+    Args:
+        urls: The OpenWebUI domain URLs, without /api at the end.
+        failure_threshold: Consecutive failures before an endpoint is skipped.
+        recovery_timeout: Seconds before a failed endpoint is tried again.
+        hedge_delay: Seconds to wait for a response before sending the same
+            request to a second endpoint. Zero disables hedging.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30,
+        hedge_delay: float = 0,
+    ):
+        if not urls:
+            raise ValueError("At least one OpenWebUI endpoint is required.")
+        self.endpoints = [
+            Endpoint(url, failure_threshold, recovery_timeout) for url in urls
+        ]
+        self.hedge_delay = hedge_delay
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client shared by all endpoints."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def pick(self, exclude: set[Endpoint] = frozenset()) -> Endpoint | None:
+        """Return the available endpoint with the least outstanding requests.
+
+        If every circuit is open and nothing is excluded, the endpoint that
+        failed the longest time ago is returned, rather than failing outright.
+        """
+        candidates = [
+            endpoint
+            for endpoint in self.endpoints
+            if endpoint not in exclude and endpoint.available
+        ]
+        if candidates:
+            return min(candidates, key=lambda endpoint: endpoint.outstanding)
+        if not exclude:
+            return min(self.endpoints, key=lambda endpoint: endpoint.opened_at)
+        return None
+
+    async def _send(
+        self, endpoint: Endpoint, method: str, path: str, **kwargs
+    ) -> httpx.Response | httpx.RequestError:
+        try:
+            response = await self.client.request(
+                method, urljoin(endpoint.url, path), **kwargs
+            )
+        except httpx.RequestError as e:
+            logger.warning("Request to %s failed: %r", endpoint.url, e)
+            endpoint.record_failure()
+            return e
+        else:
+            if is_replica_failure(response):
+                endpoint.record_failure()
+            else:
+                endpoint.record_success()
+            return response
+
+    def _start(self, tasks, endpoint, method, path, kwargs):
+        # count the request right away, so that concurrent callers spread out
+        endpoint.outstanding += 1
+        task = asyncio.create_task(self._send(endpoint, method, path, **kwargs))
+        task.add_done_callback(lambda _: endpoint.release())
+        tasks[task] = endpoint
+
+    def _start_next(self, tasks, reason, method, path, kwargs):
+        if endpoint := self.pick(exclude=set(tasks.values())):
+            logger.info("%s, sending request to %s", reason, endpoint.url)
+            self._start(tasks, endpoint, method, path, kwargs)
+
+    @staticmethod
+    async def _cancel(tasks):
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def request(
+        self, method: str, path: str, hedge: bool = True, **kwargs
+    ) -> httpx.Response:
+        """Send a request to the best endpoint.
+
+        Idempotent requests are retried on the next endpoint on connection
+        errors and gateway errors. Other requests are only retried if they
+        never reached the server, since the replica may already be running
+        their tools. Any other response is returned as it is. If every
+        endpoint failed, the last response is returned or the last error raised.
+
+        Args:
+            method: The HTTP method.
+            path: The absolute path of the API, e.g. `/api/models`.
+            hedge: Whether slow requests may be sent to a second endpoint.
+            **kwargs: Passed to `httpx.AsyncClient.request`.
+        """
+        tasks: dict[asyncio.Task, Endpoint] = {}
+        self._start(tasks, self.pick(), method, path, kwargs)
+        hedge_delay = self.hedge_delay if hedge and self.hedge_delay > 0 else None
+        result = None
+        try:
+            while pending := {task for task in tasks if not task.done()}:
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # only ever hedge once, a third replica would not be faster
+                    hedge_delay = None
+                    reason = f"No response after {self.hedge_delay}s"
+                    self._start_next(tasks, reason, method, path, kwargs)
+                    continue
+                for task in done:
+                    result = task.result()
+                    retryable = is_retryable(method, result)
+                    if isinstance(result, httpx.Response) and not retryable:
+                        return result
+                if done == pending and retryable:
+                    self._start_next(tasks, "Request failed", method, path, kwargs)
+        finally:
+            await self._cancel(tasks)
+        if isinstance(result, httpx.RequestError):
+            raise result
+        return result
+
+
+_POOL: EndpointPool | None = None
+
+
+def get_pool() -> EndpointPool:
+    """Return the endpoint pool configured for this process."""
+    global _POOL
+    if _POOL is None:
+        _POOL = EndpointPool(
+            config.OPEN_WEBUI_URLS,
+            failure_threshold=config.OPEN_WEBUI_FAILURE_THRESHOLD,
+            recovery_timeout=config.OPEN_WEBUI_RECOVERY_TIMEOUT,
+            hedge_delay=config.OPEN_WEBUI_HEDGE_DELAY,
+        )
+    return _POOL
+
+
+async def request(method: str, path: str, **kwargs) -> httpx.Response:
+    """Send a request to the configured OpenWebUI endpoints."""
+    return await get_pool().request(method, path, **kwargs)
+
+
+async def aclose():
+    """Close the connections of the configured OpenWebUI endpoints."""
+    if _POOL is not None:
+        await _POOL.aclose()
@@ -0,0 +1,142 @@
+"""Event loop health monitoring and handler profiling.
+
+Both tools inspect the event loop's thread from a separate watchdog thread,
+so they can see what the loop is executing while it is blocked.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import inspect
+import logging
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Log when the event loop is blocked and what it is executing.
+
+    Args:
+        threshold: Seconds the loop may be unresponsive before it is reported.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.interval = threshold / 2
+        self._heartbeat = time.monotonic()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._task.cancel()
+        self._stop.set()
+        self._thread.join()
+
+    async def _beat(self):
+        while True:
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - self._heartbeat - self.interval
+            if lag >= self.threshold:
+                logger.warning("Event loop was blocked for %.3fs", lag)
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            lag = time.monotonic() - heartbeat - self.interval
+            if heartbeat != reported and lag >= self.threshold:
+                # only report the stack once per stall
+                reported = heartbeat
+                frame = sys._current_frames().get(self._thread_id)
+                logger.warning(
+                    "Event loop is blocked for %.3fs, currently executing:\n%s",
+                    lag,
+                    "".join(traceback.format_stack(frame)),
+                )
+
+
+class Sampler:
+    """Sample the event loop's stack and attribute samples to handlers.
+
+    Profiles are written in the collapsed stack format, one file per handler,
+    which can be rendered by most flame graph tools. They are written on
+    SIGUSR1 and when the sampler is stopped.
+
+    Args:
+        handlers: The functions to profile.
+        directory: The directory the profiles are written to.
+        interval: Seconds between two samples.
+    """
+
+    def __init__(
+        self, handlers: list[Callable], directory: Path, interval: float = 0.005
+    ):
+        self.handlers = {
+            inspect.unwrap(handler).__code__: handler.__name__ for handler in handlers
+        }
+        self.directory = Path(directory)
+        self.interval = interval
+        self.stacks = {name: collections.Counter() for name in self.handlers.values()}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.dump)
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+        self._stop.set()
+        self._thread.join()
+        self.dump()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if frame := sys._current_frames().get(self._thread_id):
+                self.sample(frame)
+
+    def sample(self, frame):
+        """Count the stack of the given frame for each handler on it."""
+        names = []
+        handlers = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{frame.f_globals.get('__name__')}.{code.co_qualname}")
+            if code in self.handlers:
+                handlers.append((self.handlers[code], len(names)))
+            frame = frame.f_back
+        names.reverse()
+        with self._lock:
+            for name, depth in handlers:
+                self.stacks[name][";".join(names[-depth:])] += 1
+
+    def dump(self):
+        """Write the profiles collected so far."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            stacks = {name: counter.copy() for name, counter in self.stacks.items()}
+        for name, counter in stacks.items():
+            (self.directory / f"{name}.folded").write_text(
+                "".join(f"{stack} {count}\n" for stack, count in counter.items())
+            )
+        logger.info("Wrote profiles to %s", self.directory)
@@ -13,3 +13,9 @@ async def async_redis_client(url):
         yield client
     finally:
         await client.aclose()
+
+
+async def ping(url):
+    """Check that the Redis server is reachable."""
+    async with async_redis_client(url) as client:
+        await client.ping()
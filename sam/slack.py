@@ -1,21 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import functools
 import io
 import json
 import logging
 import random
 import re
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
+import aiohttp
 import httpx
-from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
-from slack_bolt.async_app import AsyncSay
+import redis.exceptions
 from slack_sdk import errors
 from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.web.client import WebClient
 
-from . import bot, config, redis_utils
+from . import bot, config, health, openwebui, profiling, redis_utils
+from .lifecycle import Lifecycle
+
+if TYPE_CHECKING:  # pragma: no cover
+    from slack_bolt.async_app import AsyncSay
 
 logger = logging.getLogger(__name__)
 
@@ -40,10 +47,10 @@ ACKNOWLEDGMENT_SMILEYS = [
 
 async def get_bot_user_id():
     """Get the Slack bot's user id."""
-    client = AsyncWebClient(token=config.SLACK_BOT_TOKEN)
     global _USER_HANDLE
     if _USER_HANDLE is None:
         logger.debug("Fetching the bot's user id")
+        client = AsyncWebClient(token=config.SLACK_BOT_TOKEN)
         response = await client.auth_test()
         _USER_HANDLE = response["user_id"]
         logger.debug("Bot's user id is %s", _USER_HANDLE)
@@ -154,18 +161,78 @@ async def send_response(
             )
 
 
-def get_app():  # pragma: no cover
+#: Seconds to wait before retrying a failed warm-up, doubled on each failure.
+WARM_UP_RETRY_DELAY = 1
+#: Maximum seconds to wait between two warm-up attempts.
+WARM_UP_MAX_RETRY_DELAY = 30
+#: Errors of unreachable services, which are worth waiting for.
+TRANSIENT_ERRORS = (
+    httpx.HTTPError,
+    redis.exceptions.ConnectionError,
+    redis.exceptions.TimeoutError,
+    aiohttp.ClientError,
+    TimeoutError,
+)
+
+
+async def warm_up():
+    """Resolve the bot's identity and open connections before accepting events.
+
+    Transient failures, like a short OpenWebUI or Redis outage during a deploy,
+    are retried with an exponential backoff until the warm-up succeeds.
+    Any other error, e.g. a misconfiguration, is raised.
+    """
+    delay = WARM_UP_RETRY_DELAY
+    while True:
+        logger.info("Warming up")
+        try:
+            # a failure cancels the other tasks, before the next attempt starts
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(get_bot_user_id())
+                tg.create_task(bot.get_tool_ids())
+                tg.create_task(redis_utils.ping(config.REDIS_URL))
+        except* TRANSIENT_ERRORS:
+            logger.exception("Warm-up failed, retrying in %ss", delay)
+        else:
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, WARM_UP_MAX_RETRY_DELAY)
+
+
+def get_app(lifecycle: Lifecycle):  # pragma: no cover
     from slack_bolt.async_app import AsyncApp
 
     app = AsyncApp(token=config.SLACK_BOT_TOKEN)
-    app.event("message")(handle_message)
-    app.event("app_mention")(send_response)
+    app.event("message")(lifecycle.track(handle_message))
+    app.event("app_mention")(lifecycle.track(send_response))
     return app
 
 
-async def run_slack():
-    handler = AsyncSocketModeHandler(get_app(), config.SLACK_APP_TOKEN)
-    await handler.start_async()
+async def run_slack(profile_dir: Path | None = None):
+    from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+
+    lifecycle = Lifecycle()
+    handler = AsyncSocketModeHandler(get_app(lifecycle), config.SLACK_APP_TOKEN)
+    async with contextlib.AsyncExitStack() as stack:
+        stack.push_async_callback(openwebui.aclose)
+        if config.LOOP_LAG_THRESHOLD:
+            stack.enter_context(profiling.LoopMonitor(config.LOOP_LAG_THRESHOLD))
+        if profile_dir:
+            handlers = [handle_message, send_response, bot.execute_run]
+            stack.enter_context(profiling.Sampler(handlers, profile_dir))
+        if config.HEALTH_PORT:
+            await stack.enter_async_context(health.serve(lifecycle, config.HEALTH_PORT))
+        await warm_up()
+        await handler.connect_async()
+        lifecycle.ready = True
+        logger.info("Ready to receive events")
+        try:
+            await lifecycle.wait()
+        finally:
+            # Slack delivers new events to our other socket connections from now on
+            await handler.close_async()
+            await lifecycle.drain(config.SHUTDOWN_TIMEOUT)
+    logger.info("Shutdown complete")
 
 
 def fetch_coworker_contacts(_context=None) -> str:
@@ -2,8 +2,10 @@ import io
 from collections import namedtuple
 from unittest import mock
 
+import httpx
 import pytest
-from sam import bot
+import respx
+from sam import bot, openwebui
 
 
 @pytest.fixture
@@ -28,3 +30,36 @@ async def test_stt(client):
         "Transcription", ["text"]
     )(text="Hello")
     assert await bot.stt(b"Hello") == "Hello"
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_get_tool_ids(monkeypatch):
+    monkeypatch.setattr(bot, "_TOOL_IDS", None)
+    monkeypatch.setattr(bot.config, "OPEN_WEBUI_MODEL", "sam")
+    monkeypatch.setattr(
+        openwebui, "_POOL", openwebui.EndpointPool(["https://openwebui.example.com"])
+    )
+    models = respx.get("https://openwebui.example.com/api/models").respond(
+        json={"data": [{"id": "sam", "info": {"meta": {"toolIds": ["search"]}}}]}
+    )
+    assert await bot.get_tool_ids() == ["search"]
+    assert await bot.get_tool_ids() == ["search"]
+    assert models.call_count == 1
+
+    monkeypatch.setattr(bot, "TOOL_IDS_TTL", -1)
+    assert await bot.get_tool_ids() == ["search"]
+    assert models.call_count == 2
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_get_tool_ids__server_error(monkeypatch):
+    monkeypatch.setattr(bot, "_TOOL_IDS", None)
+    monkeypatch.setattr(
+        openwebui, "_POOL", openwebui.EndpointPool(["https://openwebui.example.com"])
+    )
+    respx.get("https://openwebui.example.com/api/models").respond(status_code=503)
+    with pytest.raises(httpx.HTTPStatusError):
+        await bot.get_tool_ids()
+    assert bot._TOOL_IDS is None
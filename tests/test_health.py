@@ -0,0 +1,27 @@
+import httpx
+import pytest
+from sam import health
+from sam.lifecycle import Lifecycle
+
+
+@pytest.mark.asyncio
+async def test_serve():
+    lifecycle = Lifecycle()
+    async with health.serve(lifecycle, port=0) as runner:
+        # IPv4 addresses are 2-tuples, IPv6 addresses are 4-tuples
+        host, port = next(address for address in runner.addresses if len(address) == 2)
+        url = f"http://{host}:{port}/health"
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url)
+            assert response.status_code == 503
+            assert response.json() == {"status": "starting"}
+
+            lifecycle.ready = True
+            response = await client.get(url)
+            assert response.status_code == 200
+            assert response.json() == {"status": "ready"}
+
+            lifecycle.stop()
+            response = await client.get(url)
+            assert response.status_code == 503
+            assert response.json() == {"status": "stopping"}
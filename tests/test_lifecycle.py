@@ -0,0 +1,75 @@
+import asyncio
+import os
+import signal
+
+import pytest
+from sam.lifecycle import Lifecycle
+
+
+@pytest.mark.asyncio
+async def test_track():
+    lifecycle = Lifecycle()
+    started = asyncio.Event()
+
+    @lifecycle.track
+    async def handler(event, say):
+        """Handle an event."""
+        started.set()
+        await asyncio.sleep(0.01)
+        return event
+
+    task = asyncio.create_task(handler("event", say=None))
+    await started.wait()
+    assert lifecycle.tasks == {task}
+    assert await task == "event"
+    assert not lifecycle.tasks
+    assert handler.__name__ == "handler"
+
+
+@pytest.mark.asyncio
+async def test_drain():
+    lifecycle = Lifecycle()
+    finished = []
+
+    @lifecycle.track
+    async def handler():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+
+    task = asyncio.create_task(handler())
+    await asyncio.sleep(0)
+    await lifecycle.drain(timeout=5)
+    assert finished == [True]
+    assert task.done() and not task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_drain__timeout():
+    lifecycle = Lifecycle()
+    released = []
+
+    @lifecycle.track
+    async def handler():
+        try:
+            await asyncio.sleep(60)
+        finally:
+            released.append(True)
+
+    task = asyncio.create_task(handler())
+    await asyncio.sleep(0)
+    await lifecycle.drain(timeout=0.01)
+    assert task.cancelled()
+    assert released == [True]
+    assert not lifecycle.tasks
+
+
+@pytest.mark.asyncio
+async def test_wait():
+    lifecycle = Lifecycle()
+    loop = asyncio.get_running_loop()
+    task = asyncio.create_task(lifecycle.wait())
+    await asyncio.sleep(0)
+    os.kill(os.getpid(), signal.SIGTERM)
+    await asyncio.wait_for(task, timeout=5)
+    assert lifecycle.stopping.is_set()
+    assert not loop.remove_signal_handler(signal.SIGTERM)
@@ -1,9 +1,71 @@
+import subprocess
+import sys
+from unittest import mock
+
 from click.testing import CliRunner
 from sam.__main__ import cli
 
+#: Packages that are too slow to import just to render the CLI.
+HEAVY_PACKAGES = {
+    "aiohttp",
+    "httpx",
+    "openai",
+    "redis",
+    "sentry_sdk",
+    "slack_bolt",
+    "slack_sdk",
+}
+#: Maximum cumulative import time of the CLI in seconds.
+IMPORT_TIME_BUDGET = 0.5
+
+
+def import_times(module):
+    """Return the cumulative import time in seconds of each imported module."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
 
 class TestRun:
     def test_run(self):
         runner = CliRunner()
         result = runner.invoke(cli, ["run"])
         assert "Usage: cli run [OPTIONS]" in result.output
+
+    def test_run__sentry(self, monkeypatch):
+        init = mock.Mock()
+        monkeypatch.setattr("sentry_sdk.init", init)
+        run_slack = mock.AsyncMock()
+        monkeypatch.setattr("sam.slack.run_slack", run_slack)
+        runner = CliRunner()
+        result = runner.invoke(cli, ["run", "slack"])
+        assert result.exit_code == 0, result.output
+        assert init.called
+        assert run_slack.called
+
+    def test_run__profile(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("sentry_sdk.init", mock.Mock())
+        run_slack = mock.AsyncMock()
+        monkeypatch.setattr("sam.slack.run_slack", run_slack)
+        runner = CliRunner()
+        result = runner.invoke(cli, ["run", "--profile", str(tmp_path), "slack"])
+        assert result.exit_code == 0, result.output
+        assert run_slack.call_args == mock.call(profile_dir=tmp_path)
+
+
+class TestImportTime:
+    def test_lazy_imports(self):
+        imported = {name.split(".")[0] for name in import_times("sam.__main__")}
+        assert not imported & HEAVY_PACKAGES
+
+    def test_budget(self):
+        assert import_times("sam.__main__")["sam.__main__"] < IMPORT_TIME_BUDGET
@@ -0,0 +1,256 @@
+import asyncio
+import socket
+
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sam import openwebui
+
+
+def make_app(name, hits, status=200, delay=0):
+    app = web.Application()
+
+    async def handler(request):
+        hits.append(name)
+        await asyncio.sleep(delay)
+        return web.json_response({"server": name}, status=status)
+
+    app.router.add_route("*", "/api/models", handler)
+    return app
+
+
+@pytest_asyncio.fixture
+async def servers():
+    started = []
+
+    async def start(name, **kwargs):
+        server = TestServer(make_app(name, start.hits, **kwargs))
+        await server.start_server()
+        started.append(server)
+        return str(server.make_url("/"))
+
+    start.hits = []
+    yield start
+    for server in started:
+        await server.close()
+
+
+@pytest.fixture
+def dead_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+@pytest.mark.asyncio
+async def test_request(servers):
+    pool = openwebui.EndpointPool([await servers("a")])
+    response = await pool.request("GET", "/api/models")
+    assert response.json() == {"server": "a"}
+    await pool.aclose()
+
+
+def test_endpoint_pool__no_urls():
+    with pytest.raises(ValueError):
+        openwebui.EndpointPool([])
+
+
+@pytest.mark.asyncio
+async def test_request__least_outstanding(servers):
+    pool = openwebui.EndpointPool([await servers("a"), await servers("b")])
+    pool.endpoints[0].outstanding = 5
+    response = await pool.request("GET", "/api/models")
+    assert response.json() == {"server": "b"}
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__balanced(servers):
+    url_a, url_b = await servers("a", delay=0.1), await servers("b", delay=0.1)
+    pool = openwebui.EndpointPool([url_a, url_b])
+    responses = await asyncio.gather(
+        *(pool.request("GET", "/api/models") for _ in range(4))
+    )
+    assert sorted(r.json()["server"] for r in responses) == ["a", "a", "b", "b"]
+    assert all(endpoint.outstanding == 0 for endpoint in pool.endpoints)
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__failover_connection_error(servers, dead_url, caplog):
+    pool = openwebui.EndpointPool([dead_url, await servers("b")])
+    response = await pool.request("GET", "/api/models")
+    assert response.json() == {"server": "b"}
+    assert pool.endpoints[0].failures == 1
+    assert f"Request to {dead_url} failed: ConnectError(" in caplog.text
+    assert "Traceback" not in caplog.text
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__failover_server_error(servers):
+    pool = openwebui.EndpointPool([await servers("a", status=503), await servers("b")])
+    response = await pool.request("GET", "/api/models")
+    assert response.json() == {"server": "b"}
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__internal_server_error(servers):
+    pool = openwebui.EndpointPool([await servers("a", status=500), await servers("b")])
+    response = await pool.request("GET", "/api/models")
+    assert response.status_code == 500
+    assert servers.hits == ["a"]
+    assert pool.endpoints[0].failures == 0
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__post_failover_connection_error(servers, dead_url):
+    pool = openwebui.EndpointPool([dead_url, await servers("b")])
+    response = await pool.request("POST", "/api/models")
+    assert response.json() == {"server": "b"}
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__post_slow_replica(servers):
+    urls = [await servers(name, delay=1) for name in "abc"]
+    pool = openwebui.EndpointPool(urls)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(httpx.ReadTimeout):
+        await pool.request("POST", "/api/models", timeout=0.3)
+    assert loop.time() - start < 0.6
+    assert servers.hits == ["a"]
+    assert pool.endpoints[0].failures == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__post_gateway_error(servers):
+    pool = openwebui.EndpointPool([await servers("a", status=504), await servers("b")])
+    response = await pool.request("POST", "/api/models")
+    assert response.status_code == 504
+    assert servers.hits == ["a"]
+    assert pool.endpoints[0].failures == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__client_error(servers):
+    pool = openwebui.EndpointPool([await servers("a", status=404), await servers("b")])
+    response = await pool.request("GET", "/api/models")
+    assert response.status_code == 404
+    assert pool.endpoints[0].failures == 0
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__all_failed(servers, dead_url):
+    pool = openwebui.EndpointPool([dead_url])
+    with pytest.raises(httpx.ConnectError):
+        await pool.request("GET", "/api/models")
+
+    pool = openwebui.EndpointPool([dead_url, await servers("b", status=503)])
+    response = await pool.request("GET", "/api/models")
+    assert response.status_code == 503
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__circuit_breaker(servers, dead_url):
+    pool = openwebui.EndpointPool(
+        [dead_url, await servers("b")], failure_threshold=2, recovery_timeout=60
+    )
+    dead = pool.endpoints[0]
+    for _ in range(2):
+        pool.endpoints[1].outstanding = 1  # prefer the dead endpoint
+        await pool.request("GET", "/api/models")
+        pool.endpoints[1].outstanding = 0
+    assert not dead.available
+
+    pool.endpoints[1].outstanding = 1
+    assert pool.pick() is pool.endpoints[1]
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__circuit_breaker_recovery(servers):
+    pool = openwebui.EndpointPool(
+        [await servers("a")], failure_threshold=1, recovery_timeout=0
+    )
+    endpoint = pool.endpoints[0]
+    endpoint.record_failure()
+    assert endpoint.opened_at is not None
+    assert endpoint.available
+    await pool.request("GET", "/api/models")
+    assert endpoint.opened_at is None
+    assert endpoint.failures == 0
+    await pool.aclose()
+
+
+def test_available__half_open():
+    endpoint = openwebui.Endpoint("http://a/", failure_threshold=1, recovery_timeout=0)
+    endpoint.record_failure()
+    assert endpoint.available
+    endpoint.outstanding = 1  # the trial request
+    assert not endpoint.available
+    endpoint.record_success()
+    assert endpoint.available
+
+
+@pytest.mark.asyncio
+async def test_request__half_open_single_trial(servers):
+    url_a, url_b = await servers("a", delay=0.1), await servers("b", delay=0.1)
+    pool = openwebui.EndpointPool(
+        [url_a, url_b], failure_threshold=1, recovery_timeout=0
+    )
+    pool.endpoints[0].record_failure()
+    responses = await asyncio.gather(
+        *(pool.request("GET", "/api/models") for _ in range(3))
+    )
+    assert sorted(r.json()["server"] for r in responses) == ["a", "b", "b"]
+    await pool.aclose()
+
+
+def test_pick__all_open():
+    pool = openwebui.EndpointPool(["http://a/", "http://b/"], failure_threshold=1)
+    for endpoint in pool.endpoints:
+        endpoint.record_failure()
+    assert pool.pick() is pool.endpoints[0]
+    assert pool.pick(exclude={pool.endpoints[0]}) is None
+
+
+@pytest.mark.asyncio
+async def test_request__hedged(servers):
+    url_a, url_b = await servers("a", delay=5), await servers("b")
+    pool = openwebui.EndpointPool([url_a, url_b], hedge_delay=0.05)
+    pool.endpoints[1].outstanding = 1  # make sure the slow endpoint is picked first
+    response = await pool.request("GET", "/api/models")
+    assert response.json() == {"server": "b"}
+    assert pool.endpoints[0].outstanding == 0
+    assert pool.endpoints[0].failures == 0
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request__hedge_disabled(servers):
+    url_a, url_b = await servers("a", delay=0.2), await servers("b")
+    pool = openwebui.EndpointPool([url_a, url_b], hedge_delay=0.05)
+    pool.endpoints[1].outstanding = 1
+    response = await pool.request("GET", "/api/models", hedge=False)
+    assert response.json() == {"server": "a"}
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_pool(monkeypatch):
+    monkeypatch.setattr(openwebui, "_POOL", None)
+    monkeypatch.setattr(openwebui.config, "OPEN_WEBUI_URLS", ["http://a/", "http://b/"])
+    pool = openwebui.get_pool()
+    assert [endpoint.url for endpoint in pool.endpoints] == ["http://a/", "http://b/"]
+    assert openwebui.get_pool() is pool
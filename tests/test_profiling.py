@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import os
+import signal
+import sys
+import time
+
+import pytest
+from sam import profiling
+
+
+def busy(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+async def handler():
+    busy(0.1)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor(caplog):
+    with caplog.at_level(logging.WARNING), profiling.LoopMonitor(threshold=0.05):
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+    assert "Event loop is blocked for" in caplog.text
+    assert "time.sleep(0.2)" in caplog.text
+    assert "Event loop was blocked for" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor__healthy(caplog):
+    with caplog.at_level(logging.WARNING), profiling.LoopMonitor(threshold=0.05):
+        await asyncio.sleep(0.2)
+    assert "blocked" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_sampler(tmp_path):
+    with profiling.Sampler([handler], tmp_path, interval=0.001):
+        await handler()
+    profile = (tmp_path / "handler.folded").read_text()
+    stack, count = profile.splitlines()[0].rsplit(" ", 1)
+    assert stack.startswith("tests.test_profiling.handler;tests.test_profiling.busy")
+    assert int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_sampler__signal(tmp_path):
+    with profiling.Sampler([handler], tmp_path, interval=0.001):
+        await handler()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        await asyncio.sleep(0.01)
+        assert (tmp_path / "handler.folded").read_text()
+
+
+def test_sampler__sample(tmp_path):
+    sampler = profiling.Sampler([test_sampler__sample], tmp_path)
+    sampler.sample(sys_frame())
+    ((stack, count),) = sampler.stacks["test_sampler__sample"].items()
+    assert (
+        stack
+        == "tests.test_profiling.test_sampler__sample;tests.test_profiling.sys_frame"
+    )
+    assert count == 1
+
+
+def sys_frame():
+    return sys._getframe()
@@ -1,9 +1,13 @@
+import asyncio
 import logging
 from unittest import mock
 
+import httpx
 import pytest
+import redis.exceptions
 import respx
 from sam import bot, slack
+from slack_sdk import errors
 
 
 @pytest.mark.asyncio
@@ -14,6 +18,78 @@ async def test_get_bot_user_id(monkeypatch):
     assert auth_test.called
 
 
+@pytest.mark.asyncio
+async def test_get_bot_user_id__cached(monkeypatch):
+    monkeypatch.setattr(slack, "_USER_HANDLE", "bot-1")
+    client = mock.Mock()
+    monkeypatch.setattr(slack, "AsyncWebClient", client)
+    assert await slack.get_bot_user_id() == "bot-1"
+    assert not client.called
+
+
+@pytest.mark.asyncio
+async def test_warm_up(monkeypatch):
+    get_bot_user_id = mock.AsyncMock(return_value="bot-1")
+    monkeypatch.setattr(slack, "get_bot_user_id", get_bot_user_id)
+    get_tool_ids = mock.AsyncMock(return_value=[])
+    monkeypatch.setattr(bot, "get_tool_ids", get_tool_ids)
+    ping = mock.AsyncMock()
+    monkeypatch.setattr(slack.redis_utils, "ping", ping)
+    await slack.warm_up()
+    assert get_bot_user_id.called
+    assert get_tool_ids.called
+    assert ping.call_args == mock.call(slack.config.REDIS_URL)
+
+
+@pytest.mark.asyncio
+async def test_warm_up__retry(monkeypatch, caplog):
+    monkeypatch.setattr(slack, "WARM_UP_RETRY_DELAY", 0)
+    monkeypatch.setattr(slack, "get_bot_user_id", mock.AsyncMock(return_value="bot-1"))
+    monkeypatch.setattr(bot, "get_tool_ids", mock.AsyncMock(return_value=[]))
+    ping = mock.AsyncMock(
+        side_effect=[redis.exceptions.ConnectionError("Redis is down"), None]
+    )
+    monkeypatch.setattr(slack.redis_utils, "ping", ping)
+    await slack.warm_up()
+    assert ping.call_count == 2
+    assert "Warm-up failed, retrying in 0s" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_warm_up__cancel_siblings(monkeypatch):
+    monkeypatch.setattr(slack, "WARM_UP_RETRY_DELAY", 0)
+    cancelled = []
+
+    async def get_bot_user_id():
+        try:
+            await asyncio.sleep(0.1 if cancelled else 60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "bot-1"
+
+    monkeypatch.setattr(slack, "get_bot_user_id", get_bot_user_id)
+    monkeypatch.setattr(bot, "get_tool_ids", mock.AsyncMock(return_value=[]))
+    ping = mock.AsyncMock(side_effect=[httpx.ConnectError("down"), None])
+    monkeypatch.setattr(slack.redis_utils, "ping", ping)
+    await asyncio.wait_for(slack.warm_up(), timeout=5)
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_warm_up__permanent_error(monkeypatch):
+    get_bot_user_id = mock.AsyncMock(
+        side_effect=errors.SlackApiError("invalid_auth", {"error": "invalid_auth"})
+    )
+    monkeypatch.setattr(slack, "get_bot_user_id", get_bot_user_id)
+    monkeypatch.setattr(bot, "get_tool_ids", mock.AsyncMock(return_value=[]))
+    monkeypatch.setattr(slack.redis_utils, "ping", mock.AsyncMock())
+    with pytest.raises(ExceptionGroup) as exc_info:
+        await slack.warm_up()
+    assert exc_info.group_contains(errors.SlackApiError)
+    assert get_bot_user_id.call_count == 1
+
+
 @respx.mock
 @pytest.mark.asyncio
 async def test_handle_message(monkeypatch):
@@ -196,3 +272,43 @@ def test_markdown2mrkdwn():
         slack.markdown2mrkdwn("# Heading 1\n\n## Heading 2")
         == "*Heading 1*\n\n*Heading 2*"
     ), "Heading"
+
+
+@pytest.mark.asyncio
+async def test_run_slack(monkeypatch):
+    handler = mock.AsyncMock()
+    monkeypatch.setattr(
+        "slack_bolt.adapter.socket_mode.async_handler.AsyncSocketModeHandler",
+        mock.Mock(return_value=handler),
+    )
+    monkeypatch.setattr(slack, "get_app", mock.Mock())
+    warm_up = mock.AsyncMock()
+    monkeypatch.setattr(slack, "warm_up", warm_up)
+    monkeypatch.setattr(slack.Lifecycle, "wait", mock.AsyncMock())
+    drain = mock.AsyncMock()
+    monkeypatch.setattr(slack.Lifecycle, "drain", drain)
+    aclose = mock.AsyncMock()
+    monkeypatch.setattr(slack.openwebui, "aclose", aclose)
+    await slack.run_slack()
+    assert warm_up.called
+    assert handler.connect_async.called
+    assert handler.close_async.called
+    assert drain.call_args == mock.call(slack.config.SHUTDOWN_TIMEOUT)
+    assert aclose.called
+
+
+@pytest.mark.asyncio
+async def test_run_slack__warm_up_cancelled(monkeypatch):
+    monkeypatch.setattr(
+        "slack_bolt.adapter.socket_mode.async_handler.AsyncSocketModeHandler",
+        mock.Mock(),
+    )
+    monkeypatch.setattr(slack, "get_app", mock.Mock())
+    monkeypatch.setattr(
+        slack, "warm_up", mock.AsyncMock(side_effect=asyncio.CancelledError)
+    )
+    aclose = mock.AsyncMock()
+    monkeypatch.setattr(slack.openwebui, "aclose", aclose)
+    with pytest.raises(asyncio.CancelledError):
+        await slack.run_slack()
+    assert aclose.called